@@ -6,10 +6,11 @@ Importing this package does not load the Hugging Face 'datasets' module;
 use phase1_data_pipeline.loader or phase1_data_pipeline.pipeline when needed.
 """
 
-from .normalizer import normalize_restaurants, normalize_row
+from .normalizer import iter_normalized_restaurants, normalize_restaurants, normalize_row
 from .store import RestaurantStore
 
 __all__ = [
+    "iter_normalized_restaurants",
     "normalize_restaurants",
     "normalize_row",
     "RestaurantStore",
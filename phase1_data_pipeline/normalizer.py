@@ -6,10 +6,12 @@ from __future__ import annotations
 
 import re
 import logging
-from typing import Any
+from typing import Any, Iterable, Iterator
 
 import pandas as pd
 
+from .store import match_key
+
 logger = logging.getLogger(__name__)
 
 # Column names in the Hugging Face dataset (with special chars)
@@ -170,26 +172,22 @@ def normalize_row(row: dict[str, Any]) -> dict[str, Any] | None:
         "book_table": book_table,
         "phone": phone,
         "dish_liked": dish_liked,
+        "location_norm": match_key(location),
+        "cuisines_norm": match_key(cuisines),
     }
 
 
-def normalize_restaurants(
-    rows: list[dict[str, Any]],
+def iter_normalized_restaurants(
+    rows: Iterable[dict[str, Any]],
     drop_duplicates_by: tuple[str, ...] = ("name", "address"),
-) -> list[dict[str, Any]]:
+) -> Iterator[dict[str, Any]]:
     """
-    Normalize a list of raw rows and optionally drop duplicates.
-
-    Args:
-        rows: List of raw dataset row dicts.
-        drop_duplicates_by: Keys to use for deduplication (default: name + address).
+    Yield normalized restaurant dicts one at a time, skipping invalid rows and duplicates.
 
-    Returns:
-        List of normalized restaurant dicts.
+    Lets callers stream rows into RestaurantStore.insert_many without holding a
+    second full list of normalized dicts in memory.
     """
-    normalized: list[dict[str, Any]] = []
     seen: set[tuple[str, ...]] = set()
-
     for row in rows:
         out = normalize_row(row)
         if out is None:
@@ -198,8 +196,24 @@ def normalize_restaurants(
         if key in seen:
             continue
         seen.add(key)
-        normalized.append(out)
+        yield out
+
 
+def normalize_restaurants(
+    rows: list[dict[str, Any]],
+    drop_duplicates_by: tuple[str, ...] = ("name", "address"),
+) -> list[dict[str, Any]]:
+    """
+    Normalize a list of raw rows and optionally drop duplicates.
+
+    Args:
+        rows: List of raw dataset row dicts.
+        drop_duplicates_by: Keys to use for deduplication (default: name + address).
+
+    Returns:
+        List of normalized restaurant dicts.
+    """
+    normalized = list(iter_normalized_restaurants(rows, drop_duplicates_by=drop_duplicates_by))
     logger.info(
         "Normalized %d rows -> %d records (dropped %d)",
         len(rows),
@@ -9,7 +9,7 @@ from pathlib import Path
 from typing import Any
 
 from .loader import load_zomato_dataset_as_dicts
-from .normalizer import normalize_restaurants
+from .normalizer import iter_normalized_restaurants
 from .store import RestaurantStore
 
 logger = logging.getLogger(__name__)
@@ -60,18 +60,19 @@ def run_pipeline(
             "db_path": str(Path(db_path).resolve()),
         }
 
-    normalized = normalize_restaurants(raw, drop_duplicates_by=drop_duplicates_by)
-    normalized_count = len(normalized)
-
     store = RestaurantStore(db_path)
     try:
         store.connect()
         store.init_schema()
         if clear_before:
             store.clear()
-        inserted_count = store.insert_many(normalized)
+        # Stream normalized rows straight into the store; every yielded row is inserted
+        inserted_count = store.insert_many(
+            iter_normalized_restaurants(raw, drop_duplicates_by=drop_duplicates_by)
+        )
     finally:
         store.close()
+    normalized_count = inserted_count
 
     result = {
         "loaded_rows": loaded_rows,
@@ -6,8 +6,9 @@ from __future__ import annotations
 
 import sqlite3
 import logging
+from itertools import islice
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +29,9 @@ CREATE TABLE IF NOT EXISTS restaurants (
     book_table INTEGER NOT NULL DEFAULT 0,
     phone TEXT,
     dish_liked TEXT,
-    created_at TEXT DEFAULT (datetime('now'))
+    created_at TEXT DEFAULT (datetime('now')),
+    location_norm TEXT,
+    cuisines_norm TEXT
 );
 
 CREATE INDEX IF NOT EXISTS idx_restaurants_location ON restaurants(location);
@@ -40,6 +43,33 @@ CREATE INDEX IF NOT EXISTS idx_restaurants_book_table ON restaurants(book_table)
 CREATE INDEX IF NOT EXISTS idx_restaurants_cuisines ON restaurants(cuisines);
 """
 
+# Precomputed match keys (lowercase, no whitespace) filled by the normalizer
+NORM_COLUMNS = ("location_norm", "cuisines_norm")
+
+INSERT_SQL = """
+INSERT INTO restaurants (
+    name, address, url, location, listed_in_city, cuisines, rest_type,
+    rate, cost_for_two, votes, online_order, book_table, phone, dish_liked,
+    location_norm, cuisines_norm
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Rows per executemany batch in insert_many
+INSERT_CHUNK_SIZE = 1000
+
+# Columns returned to callers (match keys are internal to filtering)
+RESULT_COLUMNS = (
+    "id, name, address, url, location, listed_in_city, cuisines, rest_type, rate, "
+    "cost_for_two, votes, online_order, book_table, phone, dish_liked, created_at"
+)
+
+
+def match_key(value: str | None) -> str | None:
+    """Lowercase with all whitespace removed, for filter matching ("J P Nagar" -> "jpnagar")."""
+    if not value:
+        return None
+    return "".join(value.split()).lower() or None
+
 
 class RestaurantStore:
     """
@@ -47,13 +77,35 @@ class RestaurantStore:
     Supports insert (batch) and query by location, cost, rating, cuisines.
     """
 
-    def __init__(self, db_path: str | Path = "restaurants.db"):
+    def __init__(
+        self,
+        db_path: str | Path = "restaurants.db",
+        check_same_thread: bool = True,
+        readonly: bool = False,
+    ):
+        """
+        Args:
+            db_path: SQLite file path.
+            check_same_thread: Passed to sqlite3.connect; set False when one long-lived
+                store is shared across threads (e.g. Streamlit reruns).
+            readonly: Open an existing DB with mode=ro (no write locks; writes raise).
+        """
         self.db_path = Path(db_path)
+        self._check_same_thread = check_same_thread
+        self._readonly = readonly
         self._conn: sqlite3.Connection | None = None
+        self._has_norm: bool | None = None
 
     def connect(self) -> sqlite3.Connection:
         if self._conn is None:
-            self._conn = sqlite3.connect(str(self.db_path))
+            if self._readonly:
+                self._conn = sqlite3.connect(
+                    self.db_path.resolve().as_uri() + "?mode=ro",
+                    uri=True,
+                    check_same_thread=self._check_same_thread,
+                )
+            else:
+                self._conn = sqlite3.connect(str(self.db_path), check_same_thread=self._check_same_thread)
             self._conn.row_factory = sqlite3.Row
         return self._conn
 
@@ -61,6 +113,7 @@ class RestaurantStore:
         if self._conn is not None:
             self._conn.close()
             self._conn = None
+        self._has_norm = None
 
     def __enter__(self) -> "RestaurantStore":
         self.connect()
@@ -70,7 +123,10 @@ class RestaurantStore:
         self.close()
 
     def init_schema(self) -> None:
-        """Create tables and indexes if they do not exist. Add listed_in_city if missing (migration)."""
+        """
+        Create tables and indexes if they do not exist.
+        Migrations: add listed_in_city, and location_norm/cuisines_norm (backfilled) if missing.
+        """
         conn = self.connect()
         conn.executescript(SCHEMA_SQL)
         # Migration: add listed_in_city if table existed without it (before creating index)
@@ -82,7 +138,26 @@ class RestaurantStore:
         conn.execute(
             "CREATE INDEX IF NOT EXISTS idx_restaurants_listed_in_city ON restaurants(listed_in_city)"
         )
+        missing_norm = [c for c in NORM_COLUMNS if c not in columns]
+        for column in missing_norm:
+            conn.execute(f"ALTER TABLE restaurants ADD COLUMN {column} TEXT")
+        if missing_norm:
+            conn.execute(
+                """
+                UPDATE restaurants SET
+                    location_norm = NULLIF(REPLACE(LOWER(TRIM(COALESCE(location,''))), ' ', ''), ''),
+                    cuisines_norm = NULLIF(LOWER(REPLACE(COALESCE(cuisines,''), ' ', '')), '')
+                """
+            )
+            logger.info("Added and backfilled columns %s on restaurants", ", ".join(missing_norm))
+        # Composite index: location equality + cost range (price filters) in one index search;
+        # also serves location-only lookups.
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_restaurants_location_norm_cost "
+            "ON restaurants(location_norm, cost_for_two)"
+        )
         conn.commit()
+        self._has_norm = True
         logger.info("Schema initialized at %s", self.db_path)
 
     def clear(self) -> int:
@@ -95,42 +170,57 @@ class RestaurantStore:
         logger.info("Cleared %d rows from restaurants", count)
         return count
 
-    def insert_many(self, restaurants: list[dict[str, Any]]) -> int:
-        """Insert normalized restaurant dicts. Returns number inserted."""
-        if not restaurants:
-            return 0
+    def insert_many(self, restaurants: Iterable[dict[str, Any]]) -> int:
+        """
+        Insert normalized restaurant dicts (any iterable, e.g. a generator). Returns number inserted.
+        Rows are written in chunks of INSERT_CHUNK_SIZE and committed once at the end.
+        """
         conn = self.connect()
-        rows = [
-            (
-                r.get("name"),
-                r.get("address"),
-                r.get("url"),
-                r.get("location"),
-                r.get("listed_in_city"),
-                r.get("cuisines"),
-                r.get("rest_type"),
-                r.get("rate"),
-                r.get("cost_for_two"),
-                r.get("votes"),
-                1 if r.get("online_order") else 0,
-                1 if r.get("book_table") else 0,
-                r.get("phone"),
-                r.get("dish_liked"),
-            )
-            for r in restaurants
-        ]
-        conn.executemany(
-            """
-            INSERT INTO restaurants (
-                name, address, url, location, listed_in_city, cuisines, rest_type,
-                rate, cost_for_two, votes, online_order, book_table, phone, dish_liked
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            rows,
-        )
+        it = iter(restaurants)
+        inserted = 0
+        while True:
+            chunk = [
+                (
+                    r.get("name"),
+                    r.get("address"),
+                    r.get("url"),
+                    r.get("location"),
+                    r.get("listed_in_city"),
+                    r.get("cuisines"),
+                    r.get("rest_type"),
+                    r.get("rate"),
+                    r.get("cost_for_two"),
+                    r.get("votes"),
+                    1 if r.get("online_order") else 0,
+                    1 if r.get("book_table") else 0,
+                    r.get("phone"),
+                    r.get("dish_liked"),
+                    # Derive match keys for dicts not built by normalize_row
+                    r.get("location_norm") or match_key(r.get("location")),
+                    r.get("cuisines_norm") or match_key(r.get("cuisines")),
+                )
+                for r in islice(it, INSERT_CHUNK_SIZE)
+            ]
+            if not chunk:
+                break
+            conn.executemany(INSERT_SQL, chunk)
+            inserted += len(chunk)
+        if not inserted:
+            return 0
         conn.commit()
-        logger.info("Inserted %d restaurants", len(restaurants))
-        return len(restaurants)
+        logger.info("Inserted %d restaurants", inserted)
+        return inserted
+
+    def _has_norm_columns(self) -> bool:
+        """True if location_norm/cuisines_norm exist. DBs built before them are filtered by expression."""
+        if self._has_norm is None:
+            cur = self.connect().execute("PRAGMA table_info(restaurants)")
+            names = {row[1] for row in cur.fetchall()}
+            self._has_norm = all(c in names for c in NORM_COLUMNS)
+        return self._has_norm
+
+    def _result_columns(self) -> str:
+        return RESULT_COLUMNS if self._has_norm_columns() else "*"
 
     def count(self) -> int:
         """Return total number of restaurants in the store."""
@@ -138,10 +228,36 @@ class RestaurantStore:
         cur = conn.execute("SELECT COUNT(*) FROM restaurants")
         return cur.fetchone()[0]
 
+    def cost_stats(self, high_cost: int = 1000) -> dict[str, Any]:
+        """
+        Aggregate cost_for_two in one SQL scan (for data-quality checks).
+        Returns total rows, rows with a cost, min/max cost, count of suspicious
+        1/2 values, and count of costs >= high_cost.
+        """
+        conn = self.connect()
+        cur = conn.execute(
+            """
+            SELECT COUNT(*), COUNT(cost_for_two), MIN(cost_for_two), MAX(cost_for_two),
+                   COALESCE(SUM(cost_for_two IN (1, 2)), 0),
+                   COALESCE(SUM(cost_for_two >= ?), 0)
+            FROM restaurants
+            """,
+            (high_cost,),
+        )
+        total, with_cost, min_cost, max_cost, low_count, high_count = cur.fetchone()
+        return {
+            "total": total,
+            "with_cost": with_cost,
+            "min_cost": min_cost,
+            "max_cost": max_cost,
+            "low_count": low_count,
+            "high_count": high_count,
+        }
+
     def get_by_id(self, id: int) -> dict[str, Any] | None:
         """Return one restaurant by primary key or None."""
         conn = self.connect()
-        cur = conn.execute("SELECT * FROM restaurants WHERE id = ?", (id,))
+        cur = conn.execute(f"SELECT {self._result_columns()} FROM restaurants WHERE id = ?", (id,))
         row = cur.fetchone()
         return dict(row) if row else None
 
@@ -165,6 +281,7 @@ class RestaurantStore:
         so "JP Nagar" matches "J P Nagar" in the dataset.
         """
         conn = self.connect()
+        has_norm = self._has_norm_columns()
 
         # Step-by-step filter audit: log count after each filter
         total_before = self.count()
@@ -181,9 +298,12 @@ class RestaurantStore:
                 # returning rows that display a different location (e.g. Jayanagar) but have
                 # listed_in_city = selected (e.g. Banashankari).
                 loc_norm = "".join(loc.split()).lower()
-                conditions.append(
-                    "REPLACE(LOWER(TRIM(COALESCE(location,''))), ' ', '') = ?"
-                )
+                if has_norm:
+                    conditions.append("location_norm = ?")
+                else:
+                    conditions.append(
+                        "REPLACE(LOWER(TRIM(COALESCE(location,''))), ' ', '') = ?"
+                    )
                 params.append(loc_norm)
                 logger.info("recommend query: applying location exact filter %r -> normalized %r", location, loc_norm)
         if min_rate is not None:
@@ -202,7 +322,10 @@ class RestaurantStore:
             cu = cuisine_contains.strip()
             if cu:
                 cu_normalized = "%" + "".join(cu.split()).lower() + "%"
-                conditions.append("(COALESCE(cuisines,'') != '' AND LOWER(REPLACE(COALESCE(cuisines,''), ' ', '')) LIKE ?)")
+                if has_norm:
+                    conditions.append("cuisines_norm LIKE ?")
+                else:
+                    conditions.append("(COALESCE(cuisines,'') != '' AND LOWER(REPLACE(COALESCE(cuisines,''), ' ', '')) LIKE ?)")
                 params.append(cu_normalized)
                 logger.info("recommend query: applying cuisine_contains %r -> normalized pattern %r", cuisine_contains, cu_normalized)
         if rest_type:
@@ -228,7 +351,7 @@ class RestaurantStore:
         params_with_limit = params + [limit]
         cur = conn.execute(
             f"""
-            SELECT * FROM restaurants
+            SELECT {self._result_columns()} FROM restaurants
             WHERE {where}
             ORDER BY rate IS NULL, rate DESC, votes IS NULL, votes DESC
             LIMIT ?
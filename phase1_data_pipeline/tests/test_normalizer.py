@@ -95,6 +95,13 @@ class TestNormalizeRow:
         assert out is not None
         assert out["location"] == "Banashankari"
 
+    def test_match_keys_lowercase_without_spaces(self, sample_raw_rows):
+        row = sample_raw_rows[0].copy()
+        row["location"] = "J P Nagar"
+        out = normalize_row(row)
+        assert out["location_norm"] == "jpnagar"
+        assert out["cuisines_norm"] == "northindian,mughlai,chinese"
+
     def test_cost_range_parsed(self, sample_raw_rows):
         row = sample_raw_rows[3]  # "500,600"
         out = normalize_row(row)
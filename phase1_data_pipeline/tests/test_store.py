@@ -1,5 +1,8 @@
 """Tests for the restaurant store."""
 
+import sqlite3
+import threading
+
 import pytest
 
 from phase1_data_pipeline.store import RestaurantStore
@@ -189,7 +192,103 @@ class TestRestaurantStore:
         results = store.query(limit=2)
         assert len(results) <= 2
 
+    def test_results_exclude_match_key_columns(self, store, sample_normalized):
+        store.insert_many(sample_normalized)
+        row = store.query(limit=1)[0]
+        assert "location_norm" not in row
+        assert "cuisines_norm" not in row
+
+    def test_init_schema_backfills_match_keys_on_old_db(self, temp_db_path):
+        """DBs created before location_norm/cuisines_norm get them added and filled by init_schema."""
+        conn = sqlite3.connect(temp_db_path)
+        conn.execute(
+            "CREATE TABLE restaurants (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, "
+            "address TEXT, url TEXT, location TEXT, listed_in_city TEXT, cuisines TEXT, rest_type TEXT, "
+            "rate REAL, cost_for_two INTEGER, votes INTEGER, online_order INTEGER NOT NULL DEFAULT 0, "
+            "book_table INTEGER NOT NULL DEFAULT 0, phone TEXT, dish_liked TEXT, created_at TEXT)"
+        )
+        conn.execute(
+            "INSERT INTO restaurants (name, location, cuisines) VALUES ('Old Place', 'J P Nagar', 'North Indian, Chinese')"
+        )
+        conn.commit()
+        conn.close()
+        with RestaurantStore(temp_db_path) as s:
+            # Before migration, filters fall back to expressions on the raw columns
+            assert len(s.query(location="JP Nagar", cuisine_contains="Chinese")) == 1
+            s.init_schema()
+            assert len(s.query(location="JP Nagar", cuisine_contains="Chinese")) == 1
+            row = s.connect().execute("SELECT location_norm, cuisines_norm FROM restaurants").fetchone()
+            assert tuple(row) == ("jpnagar", "northindian,chinese")
+
+    def test_plain_dicts_get_match_keys_on_insert(self, store):
+        """Dicts not built by normalize_row still match location/cuisine filters."""
+        store.insert_many([{"name": "A", "location": "J P Nagar", "cuisines": "North Indian, Chinese"}])
+        assert [r["name"] for r in store.query(location="JP Nagar")] == ["A"]
+        assert [r["name"] for r in store.query(cuisine_contains="Chinese")] == ["A"]
+        assert [r["name"] for r in store.query(cuisine_contains="north indian")] == ["A"]
+
     def test_context_manager(self, temp_db_path):
         with RestaurantStore(temp_db_path) as s:
             s.init_schema()
             assert s.count() == 0
+
+    def test_insert_many_accepts_generator_across_chunks(self, store, monkeypatch):
+        """insert_many consumes any iterable and writes it in multiple chunks."""
+        monkeypatch.setattr("phase1_data_pipeline.store.INSERT_CHUNK_SIZE", 2)
+        rows = ({"name": f"R{i}", "location": "BTM"} for i in range(5))
+        assert store.insert_many(rows) == 5
+        assert store.count() == 5
+        assert store.insert_many(iter(())) == 0
+
+    def test_check_same_thread_false_allows_cross_thread_use(self, temp_db_path):
+        """A store built with check_same_thread=False can be queried from another thread."""
+        store = RestaurantStore(temp_db_path, check_same_thread=False)
+        store.connect()
+        store.init_schema()
+        store.insert_many([{"name": "T", "location": "BTM"}])
+        counts = []
+        t = threading.Thread(target=lambda: counts.append(store.count()))
+        t.start()
+        t.join()
+        store.close()
+        assert counts == [1]
+
+    def test_cost_stats(self, store):
+        """cost_stats aggregates cost_for_two without loading rows."""
+        assert store.cost_stats()["with_cost"] == 0
+        store.insert_many([
+            {"name": "A", "cost_for_two": 2},
+            {"name": "B", "cost_for_two": 800},
+            {"name": "C", "cost_for_two": 1500},
+            {"name": "D"},
+        ])
+        stats = store.cost_stats()
+        assert stats == {
+            "total": 4,
+            "with_cost": 3,
+            "min_cost": 2,
+            "max_cost": 1500,
+            "low_count": 1,
+            "high_count": 1,
+        }
+
+    def test_location_cost_filter_uses_composite_index(self, store):
+        """Location + price filters are served by the (location_norm, cost_for_two) index."""
+        plan = store.connect().execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM restaurants "
+            "WHERE location_norm = ? AND (cost_for_two IS NULL OR cost_for_two >= ?)",
+            ("btm", 500),
+        ).fetchall()
+        assert any("idx_restaurants_location_norm_cost" in row[3] for row in plan)
+
+    def test_readonly_store_reads_but_rejects_writes(self, store, temp_db_path):
+        """readonly=True opens the DB with mode=ro: queries work, inserts fail."""
+        store.insert_many([{"name": "R", "location": "BTM"}])
+        ro = RestaurantStore(temp_db_path, readonly=True)
+        try:
+            assert ro.count() == 1
+            assert ro.get_by_id(1)["name"] == "R"
+            with pytest.raises(sqlite3.OperationalError):
+                ro.insert_many([{"name": "X"}])
+        finally:
+            ro.close()
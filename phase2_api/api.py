@@ -6,6 +6,7 @@ Phase 5: optional cache and analytics when phase5_enhancements is available.
 from __future__ import annotations
 
 import logging
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -59,16 +60,34 @@ class RecommendResponse(BaseModel):
     relaxed: bool
 
 
+def _close_llm_clients() -> None:
+    """Close the shared Groq connection pool if Phase 3 is available."""
+    try:
+        from phase3_llm.client import close_clients
+    except ImportError:
+        return
+    close_clients()
+
+
+@asynccontextmanager
+async def _lifespan(_app: FastAPI):
+    yield
+    _close_llm_clients()
+
+
 def create_app(db_path: str | Path | None = None) -> FastAPI:
     """Create FastAPI app with recommendation and health endpoints."""
     app = FastAPI(
         title="Restaurant Recommendation API",
         description="Phase 2: Filter by preferences, returns candidate restaurants.",
         version="0.2.0",
+        lifespan=_lifespan,
     )
     recommendation_cache: Optional[Any] = (
         RecommendationCache(max_size=100) if _phase5_available else None
     )
+    # Exposed so scripts/tests can inspect cache hits
+    app.state.recommendation_cache = recommendation_cache
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
@@ -72,3 +72,4 @@ class TestPhase5Integration:
         assert d1["restaurants"] == d2["restaurants"]
         assert d1["relaxed"] == d2["relaxed"]
         assert d1["summary"] == d2["summary"]
+        assert len(client_with_data.app.state.recommendation_cache) == 1
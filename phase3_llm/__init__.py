@@ -3,20 +3,39 @@ Phase 3: Groq LLM Integration.
 
 Generates a short, readable recommendation summary from filtered restaurants
 and user preferences. Falls back to no summary if the API key is missing or the call fails.
+Importing this package does not load the Groq SDK; names below are resolved from
+their submodules on first access, and groq itself is imported when a client is built.
 """
 
-from .config import ENV_GROQ_API_KEY, get_api_key
-from .client import get_client, create_completion
-from .prompt_builder import build_messages
-from .response_parser import parse_summary
-from .service import generate_summary
-
-__all__ = [
-    "ENV_GROQ_API_KEY",
-    "get_api_key",
-    "get_client",
-    "create_completion",
-    "build_messages",
-    "parse_summary",
-    "generate_summary",
-]
+from __future__ import annotations
+
+import importlib
+from typing import Any
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    "ENV_GROQ_API_KEY": ".config",
+    "get_api_key": ".config",
+    "reset_api_key_cache": ".config",
+    "get_client": ".client",
+    "create_completion": ".client",
+    "close_clients": ".client",
+    "build_messages": ".prompt_builder",
+    "parse_summary": ".response_parser",
+    "generate_summary": ".service",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(__all__)
@@ -1,13 +1,12 @@
 """
 Groq client: configure client, call chat completion with timeout and retries.
+Clients share one pooled httpx connection so TLS sessions are reused across requests.
 """
 
 from __future__ import annotations
 
 import logging
-from typing import Any
-
-from groq import Groq
+from typing import TYPE_CHECKING, Any
 
 from .config import (
     DEFAULT_MAX_TOKENS,
@@ -18,16 +17,58 @@ from .config import (
     get_api_key,
 )
 
+if TYPE_CHECKING:
+    import httpx
+    from groq import Groq
+
 logger = logging.getLogger(__name__)
 
+# Keep-alive pool shared by every Groq client (one per api_key/timeout pair)
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 20
+HTTP_MAX_CONNECTIONS = 100
+
+_http_client: httpx.Client | None = None
+_clients: dict[tuple[str, float], Groq] = {}
+
+
+def _get_http_client() -> httpx.Client:
+    """Return the shared httpx client, creating it on first use (SDK defaults plus our pool limits)."""
+    global _http_client
+    if _http_client is None:
+        import httpx
+        from groq import DefaultHttpxClient
+
+        limits = httpx.Limits(
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            max_connections=HTTP_MAX_CONNECTIONS,
+        )
+        _http_client = DefaultHttpxClient(limits=limits)
+    return _http_client
+
 
 def get_client(api_key: str | None = None, timeout: float | None = None) -> Groq:
-    """Build Groq client. Uses GROQ_API_KEY env if api_key not provided."""
+    """Return Groq client (cached per key and timeout). Uses GROQ_API_KEY env if api_key not provided."""
     key = get_api_key(api_key)
     if not key:
         raise ValueError("Groq API key required. Set GROQ_API_KEY or pass api_key.")
     t = timeout if timeout is not None else DEFAULT_TIMEOUT_SECONDS
-    return Groq(api_key=key, timeout=t)
+    client = _clients.get((key, t))
+    if client is None:
+        # Deferred so importing this module (or phase3_llm) does not load the Groq SDK
+        from groq import Groq
+
+        client = Groq(api_key=key, timeout=t, http_client=_get_http_client())
+        _clients[(key, t)] = client
+    return client
+
+
+def close_clients() -> None:
+    """Drop cached Groq clients and close the shared connection pool (e.g. on app shutdown)."""
+    global _http_client
+    _clients.clear()
+    if _http_client is not None:
+        _http_client.close()
+        _http_client = None
 
 
 def create_completion(
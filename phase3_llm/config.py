@@ -11,6 +11,10 @@ from pathlib import Path
 # Load .env from project root (parent of phase3_llm)
 _env_loaded = False
 
+# Key read from env after the first _load_dotenv(); _UNSET until then
+_UNSET = object()
+_CACHED_KEY: object = _UNSET
+
 
 def _load_dotenv() -> None:
     global _env_loaded
@@ -40,8 +44,20 @@ MAX_RETRIES = 2
 
 
 def get_api_key(api_key: str | None = None) -> str | None:
-    """Return API key from argument or from env GROQ_API_KEY (loads .env if present)."""
-    _load_dotenv()
+    """
+    Return API key from argument or from env GROQ_API_KEY (loads .env if present).
+    The env value is read once and cached; call reset_api_key_cache() after changing it.
+    """
+    global _CACHED_KEY
     if api_key is not None and api_key.strip():
         return api_key.strip()
-    return os.environ.get(ENV_GROQ_API_KEY) or None
+    if _CACHED_KEY is _UNSET:
+        _load_dotenv()
+        _CACHED_KEY = os.environ.get(ENV_GROQ_API_KEY) or None
+    return _CACHED_KEY  # type: ignore[return-value]
+
+
+def reset_api_key_cache() -> None:
+    """Forget the cached env key so the next get_api_key() re-reads GROQ_API_KEY (for tests)."""
+    global _CACHED_KEY
+    _CACHED_KEY = _UNSET
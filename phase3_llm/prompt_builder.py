@@ -9,8 +9,12 @@ from __future__ import annotations
 
 from typing import Any
 
+# Cap on restaurants sent to the LLM. The summary highlights only 2-3 places, so the
+# top-rated matches are enough; this keeps input tokens (and Groq TPM usage) bounded.
+MAX_PROMPT_RESTAURANTS = 25
 
-SYSTEM_PROMPT = """You are a summarization assistant for restaurant search results. You will receive the complete filtered dataset—the only restaurants that matched the user's search. Your task is to write a short (2-4 sentence) friendly summary that highlights 2-3 restaurants from this list.
+
+SYSTEM_PROMPT = """You are a summarization assistant for restaurant search results. You will receive the filtered dataset—the only restaurants that matched the user's search, pre-ranked by rating and votes (best first). Your task is to write a short (2-4 sentence) friendly summary that highlights 2-3 restaurants from this list.
 
 Rules (strict):
 - The list below is the SINGLE SOURCE OF TRUTH. You may only mention restaurants that appear in that list, using their exact names.
@@ -19,6 +23,9 @@ Rules (strict):
 - When the user has selected a cuisine filter, your summary must reflect ONLY that cuisine. Do not mention or emphasize other cuisines, unrelated dish types (e.g. sweets/desserts if they did not select that), or dishes that do not belong to the user's selected cuisine. Describe each restaurant only in terms that match the user's selected filters.
 - Use a warm, conversational tone. You may acknowledge the user's search in one sentence (e.g. "Based on your search...") but every restaurant name and every cuisine/dish you mention must align with the user's selected filters and the data in the list."""
 
+# System message never changes; shared across requests (the Groq SDK only reads it)
+_SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
+
 
 def _format_restaurant(r: dict[str, Any], index: int) -> str:
     """Format one restaurant for the prompt."""
@@ -69,6 +76,16 @@ def _format_preferences(preferences: dict[str, Any]) -> str:
     return " | ".join(parts)
 
 
+def _top_restaurants(restaurants: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Rank by (rate, votes) descending and keep the first MAX_PROMPT_RESTAURANTS."""
+    ranked = sorted(
+        restaurants,
+        key=lambda r: (r.get("rate") or 0, r.get("votes") or 0),
+        reverse=True,
+    )
+    return ranked[:MAX_PROMPT_RESTAURANTS]
+
+
 def build_messages(
     restaurants: list[dict[str, Any]],
     preferences: dict[str, Any],
@@ -76,12 +93,13 @@ def build_messages(
     """
     Build messages for Groq. Only the filtered restaurant list is the source of truth.
     Preferences are used only for a one-line context; the LLM must not add or invent restaurants.
+    At most MAX_PROMPT_RESTAURANTS restaurants (highest rated first) are included.
     """
     if not restaurants:
         user_content = "The user has no matching restaurants. Reply with a single short sentence suggesting they try relaxing their filters (e.g. location or budget)."
     else:
         context_line = _format_preferences(preferences)
-        restaurant_lines = [_format_restaurant(r, i + 1) for i, r in enumerate(restaurants)]
+        restaurant_lines = [_format_restaurant(r, i + 1) for i, r in enumerate(_top_restaurants(restaurants))]
         cuisine_instruction = ""
         if preferences.get("cuisines"):
             cuisines = preferences["cuisines"]
@@ -89,13 +107,13 @@ def build_messages(
             cuisine_instruction = f"\nThe user selected cuisine(s): {cuisines_str}. In your summary, mention only dishes and offerings that match this selection. Do not highlight other cuisines (e.g. do not mention Chinese or Indonesian dishes if the user selected Thai), and do not add unrelated categories like sweets or desserts unless they match the filter.\n"
         user_content = f"""Context (user's selected filters): {context_line}.{cuisine_instruction}
 
-The following is the complete filtered result set. These are the ONLY restaurants you may mention. Summarize and recommend only from this list—do not add or invent any name.
+The following is the filtered result set, ranked by rating and votes (best first). These are the ONLY restaurants you may mention. Summarize and recommend only from this list—do not add or invent any name.
 
 {chr(10).join(restaurant_lines)}
 
 Write a short summary (2-4 sentences) highlighting 2-3 restaurants from the list above. Use only the exact names and details shown. Do not mention any other restaurant. Every cuisine or dish you mention must match the user's selected filters (e.g. if they chose Thai, describe only Thai-relevant offerings)."""
 
     return [
-        {"role": "system", "content": SYSTEM_PROMPT},
+        _SYSTEM_MESSAGE,
         {"role": "user", "content": user_content},
     ]
@@ -0,0 +1,57 @@
+"""Unit tests for client.get_client caching and the shared httpx pool (Groq SDK stubbed)."""
+
+import groq
+import pytest
+
+from phase3_llm import client as client_mod
+from phase3_llm.client import close_clients, get_client
+
+
+class FakeGroq:
+    """Records constructor kwargs instead of building a real Groq client."""
+
+    def __init__(self, api_key, timeout, http_client):
+        self.api_key = api_key
+        self.timeout = timeout
+        self.http_client = http_client
+
+
+@pytest.fixture(autouse=True)
+def fake_groq(monkeypatch):
+    monkeypatch.setattr("groq.Groq", FakeGroq)
+    close_clients()
+    yield
+    close_clients()
+
+
+class TestGetClient:
+    def test_same_key_and_timeout_reuse_client(self):
+        first = get_client(api_key="key-a", timeout=10.0)
+        assert isinstance(first, FakeGroq)
+        assert get_client(api_key="key-a", timeout=10.0) is first
+        assert get_client(api_key="key-a", timeout=20.0) is not first
+        assert get_client(api_key="key-b", timeout=10.0) is not first
+
+    def test_clients_share_one_http_client(self):
+        a = get_client(api_key="key-a")
+        b = get_client(api_key="key-b", timeout=5.0)
+        assert a.http_client is b.http_client
+        assert a.http_client is client_mod._http_client
+
+    def test_shared_pool_keeps_sdk_defaults(self):
+        pool = get_client(api_key="key-a").http_client
+        assert isinstance(pool, groq.DefaultHttpxClient)
+        assert pool.follow_redirects is True
+
+    def test_close_clients_empties_cache_and_closes_pool(self):
+        first = get_client(api_key="key-a")
+        pool = first.http_client
+        close_clients()
+
+        assert client_mod._clients == {}
+        assert client_mod._http_client is None
+        assert pool.is_closed
+
+        second = get_client(api_key="key-a")
+        assert second is not first
+        assert second.http_client is not pool
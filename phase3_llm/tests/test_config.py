@@ -0,0 +1,42 @@
+"""Unit tests for config.get_api_key: explicit key and env-key caching."""
+
+import pytest
+
+from phase3_llm import config
+from phase3_llm.config import ENV_GROQ_API_KEY, get_api_key, reset_api_key_cache
+
+
+@pytest.fixture(autouse=True)
+def fresh_key_cache(monkeypatch):
+    # Skip .env loading so only the monkeypatched env is seen
+    monkeypatch.setattr(config, "_env_loaded", True)
+    reset_api_key_cache()
+    yield
+    reset_api_key_cache()
+
+
+class TestGetApiKey:
+    def test_env_key_cached_until_reset(self, monkeypatch):
+        monkeypatch.setenv(ENV_GROQ_API_KEY, "first-key")
+        assert get_api_key() == "first-key"
+
+        monkeypatch.setenv(ENV_GROQ_API_KEY, "second-key")
+        assert get_api_key() == "first-key"
+
+        reset_api_key_cache()
+        assert get_api_key() == "second-key"
+
+    def test_missing_env_key_cached_as_none(self, monkeypatch):
+        monkeypatch.delenv(ENV_GROQ_API_KEY, raising=False)
+        assert get_api_key() is None
+
+        monkeypatch.setenv(ENV_GROQ_API_KEY, "late-key")
+        assert get_api_key() is None
+
+        reset_api_key_cache()
+        assert get_api_key() == "late-key"
+
+    def test_explicit_key_bypasses_cache(self, monkeypatch):
+        monkeypatch.setenv(ENV_GROQ_API_KEY, "env-key")
+        assert get_api_key("  explicit-key ") == "explicit-key"
+        assert get_api_key() == "env-key"
@@ -0,0 +1,42 @@
+"""Unit tests for prompt_builder: restaurant cap and ranking in the user message."""
+
+import re
+
+from phase3_llm.prompt_builder import MAX_PROMPT_RESTAURANTS, build_messages
+
+
+def _listed_names(messages):
+    """Restaurant names from the numbered '<n>. <name>' lines of the user message."""
+    content = messages[-1]["content"]
+    return re.findall(r"^\d+\. (.+)$", content, flags=re.MULTILINE)
+
+
+class TestBuildMessages:
+    def test_caps_at_max_prompt_restaurants(self):
+        restaurants = [
+            {"name": f"R{i}", "location": "BTM", "rate": 3.0 + i / 100, "votes": i}
+            for i in range(30)
+        ]
+        names = _listed_names(build_messages(restaurants, {}))
+        assert MAX_PROMPT_RESTAURANTS == 25
+        assert len(names) == MAX_PROMPT_RESTAURANTS
+        # Lowest five ratings are the ones dropped
+        assert names[0] == "R29"
+        assert "R0" not in names and "R4" not in names
+
+    def test_orders_by_rate_then_votes(self):
+        restaurants = [
+            {"name": "Low", "rate": 3.5, "votes": 900},
+            {"name": "TopFewVotes", "rate": 4.5, "votes": 10},
+            {"name": "TopManyVotes", "rate": 4.5, "votes": 500},
+        ]
+        names = _listed_names(build_messages(restaurants, {}))
+        assert names == ["TopManyVotes", "TopFewVotes", "Low"]
+
+    def test_missing_rate_sorts_last(self):
+        restaurants = [
+            {"name": "Unrated", "rate": None, "votes": 1000},
+            {"name": "Rated", "rate": 3.0, "votes": 1},
+        ]
+        names = _listed_names(build_messages(restaurants, {}))
+        assert names == ["Rated", "Unrated"]
@@ -4,26 +4,39 @@ Anonymous analytics: log recommend usage (location, cuisines) and expose popular
 
 from __future__ import annotations
 
+import heapq
+import threading
 from collections import Counter
+from operator import itemgetter
 from typing import Any, Dict, List
 
-# In-memory log of usage events (no PII; only preference keys)
-_usage_events: List[Dict[str, Any]] = []
+# In-memory usage counts, updated as requests are logged (no PII; only preference keys)
+_location_counts: Counter[str] = Counter()
+_cuisine_counts: Counter[str] = Counter()
+# Endpoints run in FastAPI's threadpool; guards updates and snapshots of both counters
+_lock = threading.Lock()
 
 
 def log_recommend_usage(body: Dict[str, Any]) -> None:
     """Log one recommend request for analytics (location, cuisines only)."""
-    event: Dict[str, Any] = {}
-    if body.get("location"):
-        event["location"] = str(body["location"]).strip()
+    location = str(body["location"]).strip() if body.get("location") else ""
+    cuisine_names: List[str] = []
     if body.get("cuisines"):
         cuisines = body["cuisines"]
-        if isinstance(cuisines, list):
-            event["cuisines"] = [str(c).strip() for c in cuisines if c]
-        else:
-            event["cuisines"] = [str(cuisines).strip()]
-    if event:
-        _usage_events.append(event)
+        if not isinstance(cuisines, list):
+            cuisines = [cuisines]
+        cuisine_names = [s for s in (str(c).strip() for c in cuisines if c) if s]
+    with _lock:
+        if location:
+            _location_counts[location] += 1
+        _cuisine_counts.update(cuisine_names)
+
+
+def _top(counts: Counter[str], n: int) -> List[Dict[str, Any]]:
+    """Top n (name, count) pairs as dicts; heap selection avoids sorting every name."""
+    with _lock:
+        items = list(counts.items())
+    return [{"name": k, "count": v} for k, v in heapq.nlargest(n, items, key=itemgetter(1))]
 
 
 def get_popular(
@@ -34,20 +47,17 @@ def get_popular(
     Return aggregated popular locations and cuisines from logged usage.
     Each item is { "name": str, "count": int }, sorted by count descending.
     """
-    loc_counter: Counter[str] = Counter()
-    cuisine_counter: Counter[str] = Counter()
-    for ev in _usage_events:
-        if ev.get("location"):
-            loc_counter[ev["location"]] += 1
-        for c in ev.get("cuisines") or []:
-            if c:
-                cuisine_counter[c] += 1
-    locations = [{"name": k, "count": v} for k, v in loc_counter.most_common(top_locations)]
-    cuisines = [{"name": k, "count": v} for k, v in cuisine_counter.most_common(top_cuisines)]
-    return {"locations": locations, "cuisines": cuisines}
+    if not _location_counts and not _cuisine_counts:
+        # Cold start: nothing logged yet, skip heap selection entirely
+        return {"locations": [], "cuisines": []}
+    return {
+        "locations": _top(_location_counts, top_locations),
+        "cuisines": _top(_cuisine_counts, top_cuisines),
+    }
 
 
 def clear_events() -> None:
     """Clear all logged events (for tests or reset)."""
-    global _usage_events
-    _usage_events = []
+    with _lock:
+        _location_counts.clear()
+        _cuisine_counts.clear()
@@ -1,67 +1,68 @@
 """
 In-memory cache for recommendation responses.
-Cache key = hash of canonical request params (location, min_rating, cost, cuisines, top_n, etc.).
+Cache key = sorted tuple of canonical request params (location, min_rating, cost, cuisines, top_n, etc.).
 """
 
 from __future__ import annotations
 
-import hashlib
-import json
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+# Sentinel for cache misses (cached values are dicts, never this object)
+_MISS: Any = object()
+
+CacheKey = Tuple[Tuple[str, Any], ...]
 
 
 def _canonical_params(body: Dict[str, Any]) -> Dict[str, Any]:
-    """Normalize request body for stable hashing (sorted lists, omit None)."""
+    """Normalize request body for stable hashing (cuisines as frozenset, omit None)."""
     out: Dict[str, Any] = {}
     for k, v in body.items():
         if v is None:
             continue
         if k == "cuisines" and isinstance(v, list):
-            out[k] = sorted(str(x) for x in v)
+            out[k] = frozenset(str(x) for x in v)
         else:
             out[k] = v
     return out
 
 
-def cache_key_from_request(body: Dict[str, Any]) -> str:
-    """Produce a stable cache key from the recommend request body."""
-    canonical = _canonical_params(body)
-    blob = json.dumps(canonical, sort_keys=True)
-    return hashlib.sha256(blob.encode()).hexdigest()
+def cache_key_from_request(body: Dict[str, Any]) -> CacheKey:
+    """Produce a stable, hashable cache key from the recommend request body."""
+    return tuple(sorted(_canonical_params(body).items()))
 
 
 class RecommendationCache:
-    """LRU-style in-memory cache for recommend responses (restaurants, summary, relaxed)."""
+    """
+    LRU-style in-memory cache for recommend responses (restaurants, summary, relaxed).
+    Recency is the dict's insertion order: hits are re-inserted at the end and the
+    first key is the least recently used.
+    """
+
+    __slots__ = ("_max_size", "_data")
 
     def __init__(self, max_size: int = 100):
         self._max_size = max(1, max_size)
-        self._data: Dict[str, Dict[str, Any]] = {}
-        self._order: list[str] = []
+        self._data: Dict[Hashable, Dict[str, Any]] = {}
 
-    def get(self, key: str) -> Optional[Dict[str, Any]]:
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
         """Return cached result if present."""
-        if key not in self._data:
+        value = self._data.pop(key, _MISS)
+        if value is _MISS:
             return None
-        # Move to end (most recently used)
-        if key in self._order:
-            self._order.remove(key)
-        self._order.append(key)
-        return self._data[key]
+        # Re-insert at the end (most recently used)
+        self._data[key] = value
+        return value
 
-    def set(self, key: str, value: Dict[str, Any]) -> None:
+    def set(self, key: Hashable, value: Dict[str, Any]) -> None:
         """Store result; evict oldest if over capacity."""
-        if key in self._data:
-            self._order.remove(key)
-        elif len(self._data) >= self._max_size and self._order:
-            oldest = self._order.pop(0)
-            del self._data[oldest]
+        self._data.pop(key, None)
         self._data[key] = value
-        self._order.append(key)
+        if len(self._data) > self._max_size:
+            del self._data[next(iter(self._data))]
 
     def clear(self) -> None:
         """Clear all entries."""
         self._data.clear()
-        self._order.clear()
 
     def __len__(self) -> int:
         return len(self._data)
@@ -1,5 +1,7 @@
 """Tests for Phase 5 anonymous analytics."""
 
+import threading
+
 import pytest
 
 from phase5_enhancements.analytics import (
@@ -22,33 +24,51 @@ class TestLogAndPopular:
         assert out["locations"] == []
         assert out["cuisines"] == []
 
-    def test_log_location_only(self):
-        log_recommend_usage({"location": "Banashankari"})
-        log_recommend_usage({"location": "Banashankari"})
-        log_recommend_usage({"location": "Koramangala"})
-        out = get_popular(top_locations=5)
-        assert len(out["locations"]) == 2
-        names = [x["name"] for x in out["locations"]]
-        counts = [x["count"] for x in out["locations"]]
-        assert "Banashankari" in names
-        assert "Koramangala" in names
-        assert 2 in counts
-        assert 1 in counts
-
-    def test_log_cuisines_only(self):
-        log_recommend_usage({"cuisines": ["North Indian", "Chinese"]})
-        log_recommend_usage({"cuisines": ["North Indian"]})
-        out = get_popular(top_cuisines=5)
-        assert any(x["name"] == "North Indian" and x["count"] == 2 for x in out["cuisines"])
-        assert any(x["name"] == "Chinese" and x["count"] == 1 for x in out["cuisines"])
-
-    def test_top_n_limits_results(self):
-        for loc in ["A", "B", "C"]:
-            log_recommend_usage({"location": loc})
-        out = get_popular(top_locations=2)
-        assert len(out["locations"]) == 2
-        out2 = get_popular(top_locations=10)
-        assert len(out2["locations"]) == 3
+    @pytest.mark.parametrize(
+        "bodies, kwargs, key, expected_len, expected_counts",
+        [
+            pytest.param(
+                [{"location": "Banashankari"}, {"location": "Banashankari"}, {"location": "Koramangala"}],
+                {"top_locations": 5},
+                "locations",
+                2,
+                {"Banashankari": 2, "Koramangala": 1},
+                id="location_only",
+            ),
+            pytest.param(
+                [{"cuisines": ["North Indian", "Chinese"]}, {"cuisines": ["North Indian"]}],
+                {"top_cuisines": 5},
+                "cuisines",
+                2,
+                {"North Indian": 2, "Chinese": 1},
+                id="cuisines_only",
+            ),
+            pytest.param(
+                [{"location": "A"}, {"location": "B"}, {"location": "C"}],
+                {"top_locations": 2},
+                "locations",
+                2,
+                {},
+                id="top_n_limits_results",
+            ),
+            pytest.param(
+                [{"location": "A"}, {"location": "B"}, {"location": "C"}],
+                {"top_locations": 10},
+                "locations",
+                3,
+                {"A": 1, "B": 1, "C": 1},
+                id="top_n_above_distinct_count",
+            ),
+        ],
+    )
+    def test_log_and_count(self, bodies, kwargs, key, expected_len, expected_counts):
+        for body in bodies:
+            log_recommend_usage(body)
+        items = get_popular(**kwargs)[key]
+        assert len(items) == expected_len
+        counts = {x["name"]: x["count"] for x in items}
+        for name, count in expected_counts.items():
+            assert counts.get(name) == count
 
     def test_clear_events_resets(self):
         log_recommend_usage({"location": "X"})
@@ -56,3 +76,37 @@ class TestLogAndPopular:
         out = get_popular()
         assert out["locations"] == []
         assert out["cuisines"] == []
+
+
+class TestConcurrency:
+    def test_popular_while_logging_new_keys(self):
+        errors = []
+
+        def writer():
+            for i in range(3000):
+                log_recommend_usage({"location": f"L{i}", "cuisines": [f"C{i}"]})
+
+        t = threading.Thread(target=writer)
+        t.start()
+        while t.is_alive():
+            try:
+                get_popular(top_locations=5, top_cuisines=5)
+            except RuntimeError as e:
+                errors.append(e)
+        t.join()
+        assert errors == []
+        assert len(get_popular(top_locations=5000)["locations"]) == 3000
+
+    def test_concurrent_logging_keeps_every_increment(self):
+        def worker():
+            for _ in range(500):
+                log_recommend_usage({"location": "Same", "cuisines": ["Cafe"]})
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        out = get_popular()
+        assert out["locations"] == [{"name": "Same", "count": 4000}]
+        assert out["cuisines"] == [{"name": "Cafe", "count": 4000}]
@@ -28,12 +28,31 @@ class TestCacheKey:
         b2 = {"location": "Y", "top_n": 15}
         assert cache_key_from_request(b1) == cache_key_from_request(b2)
 
+    def test_location_only_matches_general_key(self):
+        body = {"location": "X", "top_n": 5, "min_rating": None, "cuisines": None}
+        assert cache_key_from_request(body) == (("location", "X"), ("top_n", 5))
+        assert cache_key_from_request(body) != cache_key_from_request({**body, "min_rating": 4.0})
+
+    def test_key_is_hashable(self):
+        key = cache_key_from_request({"location": "X", "cuisines": ["Thai"], "top_n": 5})
+        assert {key: 1}[key] == 1
+
 
 class TestRecommendationCache:
     def test_get_miss_returns_none(self):
         c = RecommendationCache(max_size=10)
         assert c.get("missing") is None
 
+    def test_miss_leaves_entries_untouched(self):
+        c = RecommendationCache(max_size=2)
+        c.set("a", {"r": 1})
+        c.set("b", {"r": 2})
+        assert c.get("missing") is None
+        assert len(c) == 2
+        c.set("c", {"r": 3})
+        assert c.get("a") is None
+        assert c.get("b") is not None
+
     def test_set_and_get(self):
         c = RecommendationCache(max_size=10)
         val = {"restaurants": [], "summary": "Hi", "relaxed": False}
@@ -51,6 +70,16 @@ class TestRecommendationCache:
         assert c.get("b") is not None
         assert c.get("c") is not None
 
+    def test_get_refreshes_recency(self):
+        c = RecommendationCache(max_size=2)
+        c.set("a", {"r": 1})
+        c.set("b", {"r": 2})
+        assert c.get("a") is not None
+        c.set("c", {"r": 3})
+        assert c.get("b") is None
+        assert c.get("a") is not None
+        assert c.get("c") is not None
+
     def test_clear(self):
         c = RecommendationCache(max_size=10)
         c.set("x", {"r": 1})
@@ -67,3 +96,7 @@ class TestRecommendationCache:
         assert len(c) == 2
         c.clear()
         assert len(c) == 0
+
+    def test_no_instance_dict(self):
+        c = RecommendationCache(max_size=10)
+        assert not hasattr(c, "__dict__")
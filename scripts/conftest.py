@@ -0,0 +1,32 @@
+"""Pytest fixtures shared by the script-style test modules in scripts/."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+@pytest.fixture(scope="session")
+def make_client():
+    """
+    Factory returning a TestClient for a DB path. Each app is built once per session
+    (route registration and Pydantic model setup) and reused by every test that asks for it.
+    """
+    from fastapi.testclient import TestClient
+    from phase2_api.api import create_app
+
+    clients = {}
+
+    def _make(db_path: str | Path) -> TestClient:
+        key = str(db_path)
+        if key not in clients:
+            clients[key] = TestClient(create_app(db_path=db_path))
+        return clients[key]
+
+    return _make
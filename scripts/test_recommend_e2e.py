@@ -2,8 +2,9 @@
 """
 End-to-end test for restaurant recommendation: seed DB, call POST /recommend, verify results.
 
-Run from project root:
+Run from project root (either form; the DB is seeded once into a temp dir):
   python scripts/test_recommend_e2e.py
+  pytest scripts/test_recommend_e2e.py
 
 Logs show: dataset (DB) path and total_restaurants, filter kwargs, store before/after filter
 counts, and orchestrator relax steps when filters return 0 results.
@@ -21,11 +22,10 @@ logging.basicConfig(level=logging.INFO, format="%(name)s: %(levelname)s: %(messa
 ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT))
 
-from fastapi.testclient import TestClient
+import pytest
 
 from phase1_data_pipeline.store import RestaurantStore
 from phase1_data_pipeline.normalizer import normalize_restaurants
-from phase2_api.api import create_app
 
 # Test-only sample (same as seed_db_for_manual_testing.py); production uses Phase 1 pipeline + Hugging Face dataset
 SAMPLE = [
@@ -54,69 +54,70 @@ SAMPLE = [
 ]
 
 
-def main() -> int:
-    db_path = ROOT / "phase1_data_pipeline" / "restaurants.db"
-    db_path.parent.mkdir(parents=True, exist_ok=True)
-
-    # Seed DB (dataset loading simulation)
+@pytest.fixture(scope="module")
+def client(tmp_path_factory, make_client):
+    """Seed a temp DB once (dataset loading simulation) and share one client across tests."""
+    db_path = tmp_path_factory.mktemp("e2e") / "restaurants.db"
     store = RestaurantStore(db_path)
-    store.connect()
+    conn = store.connect()
+    # Fewer fsyncs for the bulk write; insert_many already runs in one transaction
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
     store.init_schema()
     store.clear()
     normalized = normalize_restaurants(SAMPLE)
     inserted = store.insert_many(normalized)
     store.close()
     print(f"Seeded {inserted} restaurants at {db_path}\n")
+    return make_client(db_path)
 
-    app = create_app(db_path=db_path)
-    client = TestClient(app)
 
-    # 1. No filters -> expect all 4
-    print("--- POST /recommend (no filters) ---")
+def test_no_filters_returns_all(client):
+    """No filters -> expect all 4."""
     r = client.post("/recommend", json={})
     assert r.status_code == 200, r.text
-    data = r.json()
-    restaurants = data["restaurants"]
+    restaurants = r.json()["restaurants"]
     assert len(restaurants) == 4, f"expected 4 restaurants, got {len(restaurants)}"
-    print(f"OK: got {len(restaurants)} restaurants\n")
 
-    # 2. Location Banashankari -> expect 3
-    print("--- POST /recommend (location=Banashankari) ---")
+
+def test_location_banashankari(client):
+    """Location Banashankari -> expect 3."""
     r = client.post("/recommend", json={"location": "Banashankari"})
     assert r.status_code == 200, r.text
-    data = r.json()
-    restaurants = data["restaurants"]
+    restaurants = r.json()["restaurants"]
     assert len(restaurants) == 3, f"expected 3 for Banashankari, got {len(restaurants)}"
     assert all((r.get("location") or "").lower().find("banashankari") >= 0 for r in restaurants)
-    print(f"OK: got {len(restaurants)} restaurants for Banashankari\n")
 
-    # 3. Location Koramangala -> expect 1
-    print("--- POST /recommend (location=Koramangala) ---")
+
+def test_location_koramangala(client):
+    """Location Koramangala -> expect 1."""
     r = client.post("/recommend", json={"location": "Koramangala"})
     assert r.status_code == 200, r.text
-    data = r.json()
-    restaurants = data["restaurants"]
+    restaurants = r.json()["restaurants"]
     assert len(restaurants) == 1, f"expected 1 for Koramangala, got {len(restaurants)}"
     assert restaurants[0].get("name") == "Koramangala Cafe"
-    print(f"OK: got {len(restaurants)} restaurant for Koramangala\n")
 
-    # 4. Strict filters (max_cost=250) -> 0 then relax -> expect results
-    print("--- POST /recommend (location=Banashankari, max_cost=250) ---")
+
+def test_strict_filters_do_not_relax(client):
+    """Strict filters (max_cost=250) match nothing -> empty list, relaxed=false (API does not relax)."""
     r = client.post("/recommend", json={"location": "Banashankari", "max_cost": 250})
     assert r.status_code == 200, r.text
     data = r.json()
-    restaurants = data["restaurants"]
-    assert data["relaxed"] is True, "expected relaxed=true when strict filters yield 0"
-    assert len(restaurants) >= 1, f"expected at least 1 after relax, got {len(restaurants)}"
-    print(f"OK: relaxed={data['relaxed']}, got {len(restaurants)} restaurants\n")
+    assert data["relaxed"] is False, "API uses strict matching; relaxed must be false"
+    assert data["restaurants"] == []
+
 
-    # 5. Validate restaurant shape
-    r0 = data["restaurants"][0]
+def test_restaurant_shape(client):
+    """Validate restaurant shape."""
+    r = client.post("/recommend", json={})
+    assert r.status_code == 200, r.text
+    r0 = r.json()["restaurants"][0]
     for key in ("name", "location", "rate", "cost_for_two", "url"):
         assert key in r0, f"missing key {key} in restaurant"
 
-    print("All E2E checks passed.")
-    return 0
+
+def main() -> int:
+    return pytest.main([__file__, "-v"])
 
 
 if __name__ == "__main__":
@@ -16,14 +16,84 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 
-def phase1_ok() -> bool:
-    """Phase 1: Store and normalizer can be used."""
-    try:
+def _open_for_bulk_load(store) -> None:
+    """Connect and relax fsyncs (WAL + synchronous=NORMAL) before seeding a temp DB."""
+    conn = store.connect()
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+
+
+# Raw rows for the API checks (Phase 2 recommends on Banashankari; Phase 5 only reads analytics)
+_API_SEED_ROWS = [
+    {
+        "name": "Jalsa", "address": "x", "url": "https://x", "location": "Banashankari",
+        "listed_in(city)": "Banashankari", "rate": "4.1/5", "votes": 100,
+        "approx_cost(for two people)": "800", "cuisines": "North Indian",
+        "rest_type": "Casual Dining", "online_order": "Yes", "book_table": "Yes",
+        "phone": None, "dish_liked": None,
+    },
+    {
+        "name": "J", "address": "x", "url": "https://x", "location": "L",
+        "listed_in(city)": "L", "rate": "4.0/5", "votes": 1,
+        "approx_cost(for two people)": "500", "cuisines": "North Indian",
+        "rest_type": "Casual", "online_order": "Yes", "book_table": "No",
+        "phone": None, "dish_liked": None,
+    },
+]
+
+_api_db_path: str | None = None
+# One app + TestClient per DB path, shared by the Phase 2 and Phase 5 checks
+_cached_clients: dict = {}
+
+
+def _seeded_api_db() -> str:
+    """
+    Create and seed the temp DB used by the API checks (once per run).
+    Must be a file: the API opens a new connection per request, and each
+    ":memory:" connection would see its own empty database.
+    """
+    global _api_db_path
+    if _api_db_path is None:
         from phase1_data_pipeline.store import RestaurantStore
         from phase1_data_pipeline.normalizer import normalize_restaurants
         with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
             path = f.name
         store = RestaurantStore(path)
+        _open_for_bulk_load(store)
+        store.init_schema()
+        store.insert_many(normalize_restaurants(_API_SEED_ROWS))
+        store.close()
+        _api_db_path = path
+    return _api_db_path
+
+
+def _get_client(path: str):
+    """Return a TestClient for create_app(db_path=path), built once per path."""
+    client = _cached_clients.get(path)
+    if client is None:
+        from fastapi.testclient import TestClient
+        from phase2_api.api import create_app
+        client = _cached_clients[path] = TestClient(create_app(db_path=path))
+    return client
+
+
+def _cleanup() -> None:
+    """Drop cached clients and remove the temp API DB (and WAL side files)."""
+    global _api_db_path
+    _cached_clients.clear()
+    if _api_db_path is not None:
+        for suffix in ("", "-wal", "-shm"):
+            Path(_api_db_path + suffix).unlink(missing_ok=True)
+        _api_db_path = None
+
+
+def phase1_ok() -> bool:
+    """Phase 1: Store and normalizer can be used."""
+    try:
+        from phase1_data_pipeline.store import RestaurantStore
+        from phase1_data_pipeline.normalizer import normalize_restaurants
+        # Single connection, so an in-memory DB is enough (no temp file to create/unlink)
+        store = RestaurantStore(":memory:")
         store.connect()
         store.init_schema()
         store.insert_many(normalize_restaurants([{
@@ -35,7 +105,6 @@ def phase1_ok() -> bool:
         }]))
         n = store.count()
         store.close()
-        Path(path).unlink(missing_ok=True)
         return n == 1
     except Exception as e:
         print(f"Phase 1 failed: {e}")
@@ -45,25 +114,7 @@ def phase1_ok() -> bool:
 def phase2_ok() -> bool:
     """Phase 2: API creates app, health and recommend work."""
     try:
-        from fastapi.testclient import TestClient
-        from phase2_api.api import create_app
-        from phase1_data_pipeline.store import RestaurantStore
-        from phase1_data_pipeline.normalizer import normalize_restaurants
-        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
-            path = f.name
-        store = RestaurantStore(path)
-        store.connect()
-        store.init_schema()
-        store.insert_many(normalize_restaurants([{
-            "name": "Jalsa", "address": "x", "url": "https://x", "location": "Banashankari",
-            "listed_in(city)": "Banashankari", "rate": "4.1/5", "votes": 100,
-            "approx_cost(for two people)": "800", "cuisines": "North Indian",
-            "rest_type": "Casual Dining", "online_order": "Yes", "book_table": "Yes",
-            "phone": None, "dish_liked": None,
-        }]))
-        store.close()
-        app = create_app(db_path=path)
-        client = TestClient(app)
+        client = _get_client(_seeded_api_db())
         r = client.get("/health")
         if r.status_code != 200:
             print(f"Phase 2 health: {r.status_code} {r.text}")
@@ -76,7 +127,6 @@ def phase2_ok() -> bool:
         if "restaurants" not in data or "summary" not in data or "relaxed" not in data:
             print("Phase 2 recommend: missing keys in response")
             return False
-        Path(path).unlink(missing_ok=True)
         return True
     except Exception as e:
         print(f"Phase 2 failed: {e}")
@@ -122,25 +172,7 @@ def phase5_ok() -> bool:
         if not _phase5_available:
             print("Phase 5: not available (import failed in API)")
             return False
-        from fastapi.testclient import TestClient
-        from phase2_api.api import create_app
-        from phase1_data_pipeline.store import RestaurantStore
-        from phase1_data_pipeline.normalizer import normalize_restaurants
-        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
-            path = f.name
-        store = RestaurantStore(path)
-        store.connect()
-        store.init_schema()
-        store.insert_many(normalize_restaurants([{
-            "name": "J", "address": "x", "url": "https://x", "location": "L",
-            "listed_in(city)": "L", "rate": "4.0/5", "votes": 1,
-            "approx_cost(for two people)": "500", "cuisines": "North Indian",
-            "rest_type": "Casual", "online_order": "Yes", "book_table": "No",
-            "phone": None, "dish_liked": None,
-        }]))
-        store.close()
-        app = create_app(db_path=path)
-        client = TestClient(app)
+        client = _get_client(_seeded_api_db())
         r = client.get("/analytics/popular")
         if r.status_code != 200:
             print(f"Phase 5 analytics: {r.status_code}")
@@ -149,7 +181,6 @@ def phase5_ok() -> bool:
         if "locations" not in data or "cuisines" not in data:
             print("Phase 5 analytics: missing keys")
             return False
-        Path(path).unlink(missing_ok=True)
         return True
     except Exception as e:
         print(f"Phase 5 failed: {e}")
@@ -166,12 +197,15 @@ def main() -> int:
         ("Phase 5 (cache + analytics)", phase5_ok),
     ]
     failed = []
-    for name, fn in checks:
-        if fn():
-            print(f"  {name}: OK")
-        else:
-            print(f"  {name}: FAILED")
-            failed.append(name)
+    try:
+        for name, fn in checks:
+            if fn():
+                print(f"  {name}: OK")
+            else:
+                print(f"  {name}: FAILED")
+                failed.append(name)
+    finally:
+        _cleanup()
     if failed:
         print("\nFailed:", ", ".join(failed))
         return 1
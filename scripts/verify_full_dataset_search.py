@@ -1,5 +1,10 @@
 #!/usr/bin/env python3
-"""Verify recommendation results match user search criteria (full dataset). Run from project root."""
+"""
+Verify recommendation results match user search criteria (full dataset). Run from project root:
+  python scripts/verify_full_dataset_search.py
+  pytest scripts/verify_full_dataset_search.py
+Skips when the full DB has not been built (python -m phase1_data_pipeline).
+"""
 
 from __future__ import annotations
 
@@ -9,98 +14,86 @@ from pathlib import Path
 ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT))
 
-from fastapi.testclient import TestClient
-from phase2_api.api import create_app
+import pandas as pd
+import pytest
 
+DB_PATH = ROOT / "phase1_data_pipeline" / "restaurants.db"
 
-def norm(s):
-    return "".join((s or "").lower().split())
-
-
-def matches_location(r, location):
-    if not location:
-        return True
-    loc = norm(r.get("location") or "") + norm(r.get("listed_in_city") or "")
-    return location.lower() in loc or norm(location) in loc
-
-
-def matches_cuisine(r, cuisine):
-    if not cuisine:
-        return True
-    return (cuisine or "").lower() in ((r.get("cuisines") or "").lower())
 
+MATCH_COLUMNS = ["name", "location", "listed_in_city", "cuisines", "cost_for_two", "rate"]
 
-def matches_cost(r, min_cost, max_cost):
-    c = r.get("cost_for_two")
-    if c is None:
-        return True
-    if min_cost is not None and c < min_cost:
-        return False
-    if max_cost is not None and c > max_cost:
-        return False
-    return True
 
+def norm(s):
+    return "".join((s or "").lower().split())
 
-def matches_rating(r, min_rating):
-    if min_rating is None:
-        return True
-    rate = r.get("rate")
-    if rate is None:
-        return True
-    return rate >= min_rating
 
+def _norm_col(col: pd.Series) -> pd.Series:
+    return col.fillna("").astype(str).str.lower().str.replace(r"\s+", "", regex=True)
+
+
+def build_mask(
+    df: pd.DataFrame,
+    location: str | None = None,
+    cuisine: str | None = None,
+    min_cost: int | None = None,
+    max_cost: int | None = None,
+    min_rating: float | None = None,
+) -> pd.Series:
+    """Vectorized match of result rows against search criteria (missing cost/rate pass)."""
+    mask = pd.Series(True, index=df.index)
+    if location:
+        loc = _norm_col(df["location"]) + _norm_col(df["listed_in_city"])
+        mask &= loc.str.contains(location.lower(), regex=False) | loc.str.contains(
+            norm(location), regex=False
+        )
+    if cuisine:
+        mask &= df["cuisines"].fillna("").astype(str).str.lower().str.contains(cuisine.lower(), regex=False)
+    cost = pd.to_numeric(df["cost_for_two"], errors="coerce")
+    if min_cost is not None:
+        mask &= cost.isna() | (cost >= min_cost)
+    if max_cost is not None:
+        mask &= cost.isna() | (cost <= max_cost)
+    if min_rating is not None:
+        rate = pd.to_numeric(df["rate"], errors="coerce")
+        mask &= rate.isna() | (rate >= min_rating)
+    return mask
+
+
+def _check(client, body, name, **criteria):
+    """POST body to /recommend, assert every returned restaurant matches criteria."""
+    r = client.post("/recommend", json=body)
+    assert r.status_code == 200
+    restaurants = r.json().get("restaurants", [])
+    df = pd.DataFrame.from_records(restaurants).reindex(columns=MATCH_COLUMNS)
+    failed = df.loc[~build_mask(df, **criteria)].to_dict("records")
+    _report(name, len(restaurants), failed)
 
-def main():
-    db = ROOT / "phase1_data_pipeline" / "restaurants.db"
-    app = create_app(db_path=db)
-    client = TestClient(app)
-    failed = []
-    tests = []
 
-    # 1. Location: JP Nagar
-    r = client.post("/recommend", json={"location": "JP Nagar", "top_n": 20})
-    assert r.status_code == 200
-    for x in r.json().get("restaurants", []):
-        if not matches_location(x, "JP Nagar"):
-            failed.append(("location=JP Nagar", x.get("name"), x.get("location")))
-    tests.append(("Location JP Nagar", len(r.json()["restaurants"])))
+@pytest.fixture(scope="module")
+def client(make_client):
+    if not DB_PATH.is_file():
+        pytest.skip(f"DB not found: {DB_PATH}")
+    from phase1_data_pipeline.store import RestaurantStore
+    store = RestaurantStore(DB_PATH)
+    store.connect()
+    total = store.count()
+    store.close()
+    print(f"DB total: {total} restaurants")
+    client = make_client(DB_PATH)
+    # Warm-up: prime the SQLite page cache so the checked requests don't pay first-call cost
+    client.post("/recommend", json={"top_n": 1})
+    return client
 
-    # 2. Location: BTM
-    r = client.post("/recommend", json={"location": "BTM", "top_n": 10})
-    assert r.status_code == 200
-    for x in r.json().get("restaurants", []):
-        if not matches_location(x, "BTM"):
-            failed.append(("location=BTM", x.get("name"), x.get("location")))
-    tests.append(("Location BTM", len(r.json()["restaurants"])))
 
-    # 3. Cuisine: North Indian
-    r = client.post("/recommend", json={"cuisines": ["North Indian"], "top_n": 15})
-    assert r.status_code == 200
-    for x in r.json().get("restaurants", []):
-        if not matches_cuisine(x, "North Indian"):
-            failed.append(("cuisine=North Indian", x.get("name"), x.get("cuisines")))
-    tests.append(("Cuisine North Indian", len(r.json()["restaurants"])))
+def _report(name, count, failed):
+    assert not failed, f"{len(failed)} result(s) did not match criteria: {failed[:15]}"
+    print(f"  OK  {name}: {count} results")
 
-    # 4. Price 500-1000
-    r = client.post("/recommend", json={"min_cost": 500, "max_cost": 1000, "top_n": 15})
-    assert r.status_code == 200
-    for x in r.json().get("restaurants", []):
-        if not matches_cost(x, 500, 1000):
-            failed.append(("cost 500-1000", x.get("name"), x.get("cost_for_two")))
-    tests.append(("Price 500-1000", len(r.json()["restaurants"])))
 
-    # 5. Min rating 4.0
-    r = client.post("/recommend", json={"min_rating": 4.0, "top_n": 10})
-    assert r.status_code == 200
-    for x in r.json().get("restaurants", []):
-        if not matches_rating(x, 4.0):
-            failed.append(("min_rating=4", x.get("name"), x.get("rate")))
-    tests.append(("Min rating 4.0", len(r.json()["restaurants"])))
-
-    # 6. Combined
-    r = client.post(
-        "/recommend",
-        json={
+def test_combined(client):
+    _check(
+        client,
+        {
             "location": "Indiranagar",
             "cuisines": ["Chinese"],
             "min_cost": 300,
@@ -108,45 +101,75 @@ def main():
             "min_rating": 3.5,
             "top_n": 10,
         },
+        "Combined Indiranagar+Chinese+300-800+3.5",
+        location="Indiranagar",
+        cuisine="Chinese",
+        min_cost=300,
+        max_cost=800,
+        min_rating=3.5,
     )
-    assert r.status_code == 200
-    for x in r.json().get("restaurants", []):
-        if not matches_location(x, "Indiranagar"):
-            failed.append(("combined location", x.get("name"), x.get("location")))
-        if not matches_cuisine(x, "Chinese"):
-            failed.append(("combined cuisine", x.get("name"), x.get("cuisines")))
-        if not matches_cost(x, 300, 800):
-            failed.append(("combined cost", x.get("name"), x.get("cost_for_two")))
-        if not matches_rating(x, 3.5):
-            failed.append(("combined rating", x.get("name"), x.get("rate")))
-    tests.append(("Combined Indiranagar+Chinese+300-800+3.5", len(r.json()["restaurants"])))
-
-    # 7. No filters
+
+
+def test_location_jp_nagar(client):
+    _check(client, {"location": "JP Nagar", "top_n": 20}, "Location JP Nagar", location="JP Nagar")
+
+
+def test_location_btm(client):
+    _check(client, {"location": "BTM", "top_n": 10}, "Location BTM", location="BTM")
+
+
+def test_cuisine_north_indian(client):
+    _check(
+        client,
+        {"cuisines": ["North Indian"], "top_n": 15},
+        "Cuisine North Indian",
+        cuisine="North Indian",
+    )
+
+
+def test_price_500_1000(client):
+    _check(
+        client,
+        {"min_cost": 500, "max_cost": 1000, "top_n": 15},
+        "Price 500-1000",
+        min_cost=500,
+        max_cost=1000,
+    )
+
+
+def test_min_rating_4(client):
+    _check(client, {"min_rating": 4.0, "top_n": 10}, "Min rating 4.0", min_rating=4.0)
+
+
+def test_no_filters(client):
     r = client.post("/recommend", json={"top_n": 5})
     assert r.status_code == 200
     n = len(r.json().get("restaurants", []))
     assert n <= 5
-    tests.append(("No filters top_n=5", n))
+    _report("No filters top_n=5", n, [])
 
-    from phase1_data_pipeline.store import RestaurantStore
-    store = RestaurantStore(db)
-    store.connect()
-    total = store.count()
-    store.close()
 
-    print("Full-dataset search-criteria verification")
-    print("=" * 55)
-    print(f"DB total: {total} restaurants")
-    for name, count in tests:
-        print(f"  OK  {name}: {count} results")
-    if failed:
-        print("\nFAILED:", len(failed), "result(s) did not match criteria")
-        for f in failed[:15]:
-            print(" ", f)
-        sys.exit(1)
-    print("\nAll results match user search criteria.")
-    return 0
+def test_repeat_request_is_cache_hit(client, monkeypatch):
+    """Repeat no-filter request: must be served from the Phase 5 cache."""
+    cache = client.app.state.recommendation_cache
+    if cache is None:
+        pytest.skip("Phase 5 cache not available")
+    r = client.post("/recommend", json={"top_n": 5})
+    assert r.status_code == 200
+
+    def _not_cached(*args, **kwargs):
+        raise AssertionError("repeated request reached the orchestrator (cache miss)")
+
+    monkeypatch.setattr("phase2_api.api.recommend", _not_cached)
+    r2 = client.post("/recommend", json={"top_n": 5})
+    assert r2.status_code == 200
+    assert r2.json() == r.json(), "cached response differs from original"
+    _report("Repeat no filters (cache hit)", len(r2.json().get("restaurants", [])), [])
+
+
+def main() -> int:
+    return pytest.main([__file__, "-v", "-s"])
 
 
 if __name__ == "__main__":
-    sys.exit(main() or 0)
+    sys.exit(main())
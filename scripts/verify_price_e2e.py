@@ -4,120 +4,162 @@ End-to-end verification of price-for-two after full dataset load.
 
 Checks:
 1. Database: no cost_for_two 1 or 2; distribution and sample of high-cost rows.
-2. API: /recommend with price filters returns only in-range restaurants; no 1/2 in response.
-3. Consistency: same cost values in API response and in prompt (summary input).
+2. Price filters: store queries for each price band return only in-range restaurants.
+3. API: no 1/2 in an unfiltered /recommend; one price-filtered /recommend returns only in-range restaurants.
+4. Summary: no mistaken ₹1/₹2 in the LLM summary.
 
 Run from repo root after: python -m phase1_data_pipeline --cache-dir ./phase1_data_pipeline/.hf_cache
 """
 
 from __future__ import annotations
 
+import argparse
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 # Repo root
 ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT))
 
-from phase1_data_pipeline.store import RestaurantStore
-from phase2_api.api import create_app
-from fastapi.testclient import TestClient
+# Heavy imports (pandas via phase1 package, FastAPI/Starlette) are deferred to the
+# functions that use them so --help and import stay fast
+if TYPE_CHECKING:
+    from fastapi.testclient import TestClient
 
 DEFAULT_DB = ROOT / "phase1_data_pipeline" / "restaurants.db"
 
+# Mistaken ₹1 / ₹2 price in summary text (not followed by more digits)
+_BAD_RUPEE = re.compile(r"₹\s*[12]\s*(?![0-9])")
+
+
+def verify_db(db_path: Path, notes: list[str] | None = None) -> tuple[bool, list[str]]:
+    """
+    Verify no cost 1/2 in DB; return (ok, errors).
+    The stats line is appended to notes when given (so the caller prints it under its
+    step header), otherwise printed directly.
+    """
+    from phase1_data_pipeline.store import RestaurantStore
 
-def verify_db(db_path: Path) -> tuple[bool, list[str]]:
-    """Verify no cost 1/2 in DB; return (ok, errors)."""
     errors = []
-    store = RestaurantStore(db_path)
+    store = RestaurantStore(db_path, readonly=True)
     store.connect()
     try:
-        rows = store.query(limit=20000)
-        costs = [r.get("cost_for_two") for r in rows if r.get("cost_for_two") is not None]
-        bad = [c for c in costs if c in (1, 2)]
-        if bad:
-            errors.append(f"DB has cost_for_two in (1, 2): count={len(bad)}, sample={bad[:20]}")
-        if not costs:
+        stats = store.cost_stats()
+        if stats["low_count"]:
+            sample = [
+                row[0]
+                for row in store.connect().execute(
+                    "SELECT cost_for_two FROM restaurants WHERE cost_for_two IN (1, 2) LIMIT 20"
+                )
+            ]
+            errors.append(f"DB has cost_for_two in (1, 2): count={stats['low_count']}, sample={sample}")
+        if not stats["with_cost"]:
             errors.append("DB has no cost_for_two values")
         else:
-            high = [c for c in costs if c >= 1000]
-            if not high and len(costs) > 100:
+            if not stats["high_count"] and stats["with_cost"] > 100:
                 errors.append("DB has no cost_for_two >= 1000 (possible parsing issue)")
             # Log stats for confirmation
-            print(f"  Stats: {len(rows)} rows, {len(costs)} with cost; min={min(costs)}, max={max(costs)}; cost>=1000: {len(high)}")
+            line = (
+                f"  Stats: {stats['total']} rows, {stats['with_cost']} with cost; "
+                f"min={stats['min_cost']}, max={stats['max_cost']}; cost>=1000: {stats['high_count']}"
+            )
+            if notes is None:
+                print(line)
+            else:
+                notes.append(line)
         return (len(errors) == 0, errors)
     finally:
         store.close()
 
 
-def verify_api(db_path: Path) -> tuple[bool, list[str]]:
-    """Verify API responses: no cost 1/2, price filters return in-range only."""
-    errors = []
-    app = create_app(db_path=db_path)
-    client = TestClient(app)
+# Price-filter checks: (filters, label, is_bad(cost)); filters use the /recommend field names
+PRICE_FILTER_CHECKS = [
+    (
+        {"location": "HSR Layout", "min_cost": 500, "max_cost": 1000, "top_n": 30},
+        "Price filter 500-1000",
+        lambda c: c < 500 or c > 1000,
+    ),
+    (
+        {"location": "Koramangala", "min_cost": 1000, "max_cost": 1500, "top_n": 30},
+        "Price filter 1000-1500",
+        lambda c: c < 1000 or c > 1500,
+    ),
+    ({"min_cost": 2000, "top_n": 20}, "Price filter 2000+", lambda c: c < 2000),
+]
+
+
+def _cost_violations(restaurants: list[dict], label: str, is_bad, fail_fast: bool) -> list[str]:
+    """
+    Return an error per restaurant whose cost_for_two is_bad.
+    Violations come from a generator, so with fail_fast the scan stops at the first hit.
+    """
+    violations = (
+        rest
+        for rest in restaurants
+        if rest.get("cost_for_two") is not None and is_bad(rest["cost_for_two"])
+    )
+    if fail_fast:
+        first = next(violations, None)
+        violations = () if first is None else (first,)
+    return [f"{label}: {rest.get('name')} has cost {rest['cost_for_two']}" for rest in violations]
+
 
-    # 1) No 1 or 2 in any response
+def verify_price_filters(db_path: Path, fail_fast: bool = False) -> tuple[bool, list[str]]:
+    """
+    Verify price filters at the store level (same query the API runs, no HTTP or LLM summary).
+    With fail_fast, stop at the first bad restaurant.
+    """
+    from phase1_data_pipeline.store import RestaurantStore
+
+    errors: list[str] = []
+    store = RestaurantStore(db_path, readonly=True)
+    store.connect()
+    try:
+        for filters, label, is_bad in PRICE_FILTER_CHECKS:
+            rows = store.query(
+                location=filters.get("location"),
+                min_cost=filters.get("min_cost"),
+                max_cost=filters.get("max_cost"),
+                limit=filters["top_n"],
+            )
+            errors.extend(_cost_violations(rows, label, is_bad, fail_fast))
+            if errors and fail_fast:
+                break
+        return (len(errors) == 0, errors)
+    finally:
+        store.close()
+
+
+def verify_api(client: TestClient, fail_fast: bool = False) -> tuple[bool, list[str]]:
+    """
+    Verify API responses: no cost 1/2 in an unfiltered /recommend, and one price-filtered
+    /recommend returns only in-range results.
+    Range coverage for the other price bands is in verify_price_filters (no LLM call per band).
+    """
     r = client.post("/recommend", json={"location": "Koramangala", "top_n": 50})
     if r.status_code != 200:
-        errors.append(f"API /recommend failed: {r.status_code} {r.text[:200]}")
-    else:
-        data = r.json()
-        for rest in data.get("restaurants", []):
-            cost = rest.get("cost_for_two")
-            if cost is not None and cost in (1, 2):
-                errors.append(f"API returned cost_for_two={cost} for {rest.get('name')}")
-
-    # 2) Price range 500-1000: all in range
-    r = client.post(
-        "/recommend",
-        json={"location": "HSR Layout", "min_cost": 500, "max_cost": 1000, "top_n": 30},
-    )
-    if r.status_code != 200:
-        errors.append(f"API price filter request failed: {r.status_code}")
-    else:
-        data = r.json()
-        for rest in data.get("restaurants", []):
-            cost = rest.get("cost_for_two")
-            if cost is not None and (cost < 500 or cost > 1000):
-                errors.append(f"Price filter 500-1000: {rest.get('name')} has cost {cost}")
-
-    # 3) Price range 1000-1500: all in range
-    r = client.post(
-        "/recommend",
-        json={"location": "Koramangala", "min_cost": 1000, "max_cost": 1500, "top_n": 30},
+        return (False, [f"API /recommend failed: {r.status_code} {r.text[:200]}"])
+    errors = _cost_violations(
+        r.json().get("restaurants", []), "API returned cost_for_two in (1, 2)", lambda c: c in (1, 2), fail_fast
     )
-    if r.status_code != 200:
-        errors.append(f"API price filter 1000-1500 failed: {r.status_code}")
-    else:
-        data = r.json()
-        for rest in data.get("restaurants", []):
-            cost = rest.get("cost_for_two")
-            if cost is not None and (cost < 1000 or cost > 1500):
-                errors.append(f"Price filter 1000-1500: {rest.get('name')} has cost {cost}")
-
-    # 4) Price range 2000+: all >= 2000
-    r = client.post(
-        "/recommend",
-        json={"min_cost": 2000, "top_n": 20},
-    )
-    if r.status_code != 200:
-        errors.append(f"API min_cost 2000 failed: {r.status_code}")
-    else:
-        data = r.json()
-        for rest in data.get("restaurants", []):
-            cost = rest.get("cost_for_two")
-            if cost is not None and cost < 2000:
-                errors.append(f"Price filter 2000+: {rest.get('name')} has cost {cost}")
+    if errors and fail_fast:
+        return (False, errors)
 
+    body, label, is_bad = PRICE_FILTER_CHECKS[0]
+    r = client.post("/recommend", json=body)
+    if r.status_code != 200:
+        errors.append(f"API price filter request failed: {r.status_code} {r.text[:200]}")
+        return (False, errors)
+    errors += _cost_violations(r.json().get("restaurants", []), f"API {label}", is_bad, fail_fast)
     return (len(errors) == 0, errors)
 
 
-def verify_summary_no_wrong_prices(db_path: Path) -> tuple[bool, list[str]]:
+def verify_summary_no_wrong_prices(client: TestClient) -> tuple[bool, list[str]]:
     """Verify summary text does not contain mistaken ₹1 or ₹2 for prices."""
-    import re
     errors = []
-    app = create_app(db_path=db_path)
-    client = TestClient(app)
     r = client.post(
         "/recommend",
         json={"location": "Indiranagar", "min_cost": 800, "max_cost": 1500, "top_n": 10},
@@ -128,45 +170,67 @@ def verify_summary_no_wrong_prices(db_path: Path) -> tuple[bool, list[str]]:
     data = r.json()
     summary = data.get("summary")
     if summary:
-        bad = re.compile(r"₹\s*[12]\s*(?![0-9])")
-        if bad.search(summary):
+        if _BAD_RUPEE.search(summary):
             errors.append(f"Summary contains mistaken ₹1/₹2: ...{summary[:200]}...")
     return (len(errors) == 0, errors)
 
 
+def _db_checks(db_path: Path, fail_fast: bool, db_notes: list[str]) -> list[tuple[bool, list[str]]]:
+    """Steps 1-2: direct SQLite checks (step 1 stats go to db_notes, printed by main)."""
+    return [verify_db(db_path, notes=db_notes), verify_price_filters(db_path, fail_fast=fail_fast)]
+
+
+def _api_checks(db_path: Path, fail_fast: bool) -> list[tuple[bool, list[str]]]:
+    """Steps 3-4: API checks, sequential on one app/client (route and model setup happen once)."""
+    from fastapi.testclient import TestClient
+    from phase2_api.api import create_app
+
+    client = TestClient(create_app(db_path=db_path))
+    return [verify_api(client, fail_fast=fail_fast), verify_summary_no_wrong_prices(client)]
+
+
 def main() -> int:
+    parser = argparse.ArgumentParser(description="Price-for-two E2E verification on the full DB.")
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Stop filter/API checks at the first bad result (useful in CI).",
+    )
+    args = parser.parse_args()
     db_path = DEFAULT_DB
     if not db_path.exists():
         print(f"DB not found: {db_path}", file=sys.stderr)
         return 1
 
+    # DB-side checks and API-side checks are independent: run the two groups on
+    # separate threads (each group keeps its own store/client) and report in order.
+    db_notes: list[str] = []
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        db_future = ex.submit(_db_checks, db_path, args.fail_fast, db_notes)
+        api_future = ex.submit(_api_checks, db_path, args.fail_fast)
+        results = db_future.result() + api_future.result()
+
+    steps = [
+        ("1. Database verification", "No cost_for_two 1 or 2; distribution looks valid."),
+        ("2. Price filter verification (store query)", "Price filters return in-range only."),
+        (
+            "3. API verification (no 1/2 in response, price filter wiring)",
+            "No 1/2 in unfiltered response; API price filter returns in-range only.",
+        ),
+        ("4. Summary verification (no ₹1/₹2 in summary)", "Summary does not contain mistaken ₹1 or ₹2."),
+    ]
+    notes_by_step = {0: db_notes}
     all_ok = True
-    print("=== 1. Database verification ===")
-    ok, errs = verify_db(db_path)
-    if ok:
-        print("  OK: No cost_for_two 1 or 2; distribution looks valid.")
-    else:
-        for e in errs:
-            print(f"  ERROR: {e}", file=sys.stderr)
-        all_ok = False
-
-    print("=== 2. API verification (price filters, no 1/2 in response) ===")
-    ok, errs = verify_api(db_path)
-    if ok:
-        print("  OK: Price filters return in-range only; no 1/2 in responses.")
-    else:
-        for e in errs:
-            print(f"  ERROR: {e}", file=sys.stderr)
-        all_ok = False
-
-    print("=== 3. Summary verification (no ₹1/₹2 in summary) ===")
-    ok, errs = verify_summary_no_wrong_prices(db_path)
-    if ok:
-        print("  OK: Summary does not contain mistaken ₹1 or ₹2.")
-    else:
-        for e in errs:
-            print(f"  ERROR: {e}", file=sys.stderr)
-        all_ok = False
+    for i, ((title, ok_msg), (ok, errs)) in enumerate(zip(steps, results)):
+        print(f"=== {title} ===")
+        for line in notes_by_step.get(i, ()):
+            print(line)
+        if ok:
+            print(f"  OK: {ok_msg}")
+        else:
+            for e in errs:
+                print(f"  ERROR: {e}", file=sys.stderr)
+            all_ok = False
 
     if all_ok:
         print("\nAll price-for-two E2E checks passed.")
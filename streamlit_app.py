@@ -10,6 +10,7 @@ from __future__ import annotations
 
 import html
 import os
+import sqlite3
 import sys
 from pathlib import Path
 
@@ -25,6 +26,9 @@ from phase2_api.preferences import RecommendPreferences
 from phase2_api.orchestrator import recommend
 
 DEFAULT_DB = ROOT / "phase1_data_pipeline" / "restaurants.db"
+# RESTAURANT_DB_PATH overrides the bundled DB location. Streamlit re-executes this script
+# on every rerun, so this is re-evaluated each time; only the is_file() stat is per session.
+DB_PATH = Path(os.environ.get("RESTAURANT_DB_PATH", str(DEFAULT_DB)))
 TOP_N = 15
 
 # Zomato-style design tokens (aligned with phase4_web_ui/css/styles.css)
@@ -206,6 +210,13 @@ PHASE4_CSS = f"""
 </style>
 """
 
+# CSS + top bar + tagline, sent as a single markdown element per rerun
+PAGE_HEADER_HTML = (
+    PHASE4_CSS
+    + '<div class="streamlit-zomato-topbar">◆ Zomato Restaurant Recommendations</div>'
+    '<p class="streamlit-zomato-tagline">Find the best places to eat at your location</p>'
+)
+
 # CSS for restaurant grid iframe (same design tokens, self-contained)
 GRID_IFRAME_CSS = f"""
   * {{ box-sizing: border-box; }}
@@ -256,8 +267,15 @@ GRID_IFRAME_CSS = f"""
   }}
 """
 
+# Fixed prefix/suffix of the grid iframe document (cards go in between)
+_GRID_DOC_HEAD = (
+    f'<!DOCTYPE html><html><head><style>{GRID_IFRAME_CSS}</style></head>'
+    '<body><div class="streamlit-zomato-grid">'
+)
+_GRID_DOC_TAIL = "</div></body></html>"
+
 # Price range options: (label, min_cost, max_cost) — None means no bound
-PRICE_RANGES = [
+PRICE_RANGES = (
     ("Any", None, None),
     ("Under ₹250", None, 250),
     ("₹250 – ₹500", 250, 500),
@@ -265,44 +283,91 @@ PRICE_RANGES = [
     ("₹1000 – ₹1500", 1000, 1500),
     ("₹1500 – ₹2000", 1500, 2000),
     ("Above ₹2000", 2000, None),
-]
+)
+_PRICE_MIN = tuple(p[1] for p in PRICE_RANGES)
+_PRICE_MAX = tuple(p[2] for p in PRICE_RANGES)
+
+
+@st.cache_resource
+def get_store(db_path: str) -> RestaurantStore:
+    """One long-lived connected store per DB path, shared across reruns (Streamlit owns its lifetime)."""
+    # Read-only: the app never writes (first-time pipeline uses its own store)
+    store = RestaurantStore(Path(db_path), check_same_thread=False, readonly=True)
+    conn = store.connect()
+    # Read-heavy tuning: in-memory temp b-trees (ORDER BY/DISTINCT), 64 MB page cache, 256 MB mmap
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-65536")
+    conn.execute("PRAGMA mmap_size=268435456")
+    return store
 
 
-def get_store(db_path: Path) -> RestaurantStore:
-    store = RestaurantStore(db_path)
-    store.connect()
-    return store
+@st.cache_resource(ttl=3600, show_spinner=False)
+def location_options(db_path: str) -> tuple[str | None, ...]:
+    """Location selectbox options (None = Any); the immutable tuple is shared across reruns, not copied."""
+    return (None, *get_store(db_path).get_distinct_locations())
+
 
+@st.cache_resource(ttl=3600, show_spinner=False)
+def cuisine_options(db_path: str) -> tuple[str | None, ...]:
+    """Cuisine selectbox options (None = Any); the immutable tuple is shared across reruns, not copied."""
+    return (None, *get_store(db_path).get_distinct_cuisines())
 
-def load_locations(store: RestaurantStore) -> list[str]:
-    return store.get_distinct_locations()
 
+@st.cache_data(ttl=600, show_spinner="Finding restaurants…")
+def _cached_recommend(
+    db_path: str,
+    location: str | None,
+    min_rating: float | None,
+    min_cost: int | None,
+    max_cost: int | None,
+    cuisine: str | None,
+    top_n: int,
+) -> dict:
+    """Run the recommend pipeline (filter + LLM summary); repeat clicks with the same filters hit the cache."""
+    prefs = RecommendPreferences(
+        location=location or None,
+        min_rating=min_rating,
+        min_cost=min_cost,
+        max_cost=max_cost,
+        cuisines=[cuisine] if cuisine else None,
+    )
+    return recommend(get_store(db_path), prefs, top_n=top_n, relax_if_empty=False)
 
-def load_cuisines(store: RestaurantStore) -> list[str]:
-    return store.get_distinct_cuisines()
+
+def _summary_html(summary: str) -> str:
+    """Escaped summary card markup."""
+    return f'<div class="streamlit-zomato-summary"><p class="streamlit-zomato-summary-text">{html.escape(summary)}</p></div>'
+
+
+# Card markup for one restaurant (filled by _render_restaurant_card)
+_CARD_TMPL = (
+    '<article class="streamlit-zomato-card"><h3 class="streamlit-zomato-card-name">{name_html}</h3>'
+    '<p class="streamlit-zomato-meta">{meta}</p>{cuisines_block}</article>'
+)
 
 
 def _render_restaurant_card(r: dict) -> str:
     """HTML for one restaurant card (match Phase 4 js/app.js renderRestaurantCard).
     Returns a single line so st.markdown(unsafe_allow_html=True) does not treat
     subsequent lines as Markdown code blocks."""
-    name = html.escape(str(r.get("name") or "Unnamed"))
-    location_val = str(r.get("location") or "")
+    esc = html.escape
+    name = esc(str(r.get("name") or "Unnamed"))
+    # rate/cost are numeric, so their formatted strings need no escaping
     rate = r.get("rate")
     rate_str = str(rate) if rate is not None else "—"
     cost = r.get("cost_for_two")
     cost_str = f"₹{cost:,}" if cost is not None else "—"
-    cuisines_str = html.escape(str(r.get("cuisines") or ""))
+    cuisines_str = esc(str(r.get("cuisines") or ""))
     url = r.get("url")
     if url:
-        url_esc = html.escape(url, quote=True)
-        name_html = f'<a href="{url_esc}" target="_blank" rel="noopener">{name}</a>'
+        name_html = f'<a href="{esc(url, quote=True)}" target="_blank" rel="noopener">{name}</a>'
     else:
         name_html = name
-    meta = f"{location_val} · Rating {rate_str}/5 · {cost_str} for two"
-    meta_esc = html.escape(meta)
-    cuisines_block = f'<p class="streamlit-zomato-cuisines">{cuisines_str}</p>' if cuisines_str else ""
-    return f'<article class="streamlit-zomato-card"><h3 class="streamlit-zomato-card-name">{name_html}</h3><p class="streamlit-zomato-meta">{meta_esc}</p>{cuisines_block}</article>'
+    return _CARD_TMPL.format_map({
+        "name_html": name_html,
+        "meta": f"{esc(str(r.get('location') or ''))} · Rating {rate_str}/5 · {cost_str} for two",
+        "cuisines_block": f'<p class="streamlit-zomato-cuisines">{cuisines_str}</p>' if cuisines_str else "",
+    })
 
 
 def main() -> None:
@@ -311,22 +376,20 @@ def main() -> None:
         page_icon="🍽️",
         layout="wide",
     )
-    st.markdown(PHASE4_CSS, unsafe_allow_html=True)
-    st.markdown(
-        '<div class="streamlit-zomato-topbar">◆ Zomato Restaurant Recommendations</div>'
-        '<p class="streamlit-zomato-tagline">Find the best places to eat at your location</p>',
-        unsafe_allow_html=True,
-    )
+    # Must be emitted on every rerun: Streamlit drops elements a rerun does not re-render
+    st.markdown(PAGE_HEADER_HTML, unsafe_allow_html=True)
 
-    db_path = Path(os.environ.get("RESTAURANT_DB_PATH", str(DEFAULT_DB)))
-    if not db_path.is_file():
+    db_path = DB_PATH
+    # Stat the DB file once per session; later reruns skip the filesystem check
+    if not st.session_state.get("_db_ok") and not db_path.is_file():
         # First-time deploy: run the data pipeline to create the database (lazy import to avoid loading Hugging Face deps when DB exists).
         db_path.parent.mkdir(parents=True, exist_ok=True)
         with st.spinner("First-time setup: loading dataset (this may take a minute)…"):
             try:
                 from phase1_data_pipeline.pipeline import run_pipeline
                 run_pipeline(db_path=str(db_path), max_rows=None, clear_before=True)
-            except Exception as e:
+            except (ImportError, OSError, sqlite3.Error, ValueError, RuntimeError) as e:
+                # Missing pipeline deps, download/disk errors, bad data; anything else is a bug and surfaces
                 st.error(f"Could not create database: {e}")
                 return
         if not db_path.is_file():
@@ -335,12 +398,9 @@ def main() -> None:
         st.success("Dataset loaded. You can now use the filters below.")
         st.rerun()
 
-    store = get_store(db_path)
-    try:
-        locations = load_locations(store)
-        cuisines = load_cuisines(store)
-    finally:
-        store.close()
+    st.session_state["_db_ok"] = True
+    locations = location_options(str(db_path))
+    cuisines = cuisine_options(str(db_path))
 
     with st.sidebar:
         col_head, col_reset = st.columns([1, 1])
@@ -356,7 +416,7 @@ def main() -> None:
             st.rerun()
         location = st.selectbox(
             "Location",
-            options=[None] + locations,
+            options=locations,
             format_func=lambda x: "Any" if x is None else x,
             key="location",
         )
@@ -366,7 +426,7 @@ def main() -> None:
             format_func=lambda i: PRICE_RANGES[i][0],
             key="price",
         )
-        min_cost, max_cost = PRICE_RANGES[price_label][1], PRICE_RANGES[price_label][2]
+        min_cost, max_cost = _PRICE_MIN[price_label], _PRICE_MAX[price_label]
         min_rating_choice = st.selectbox(
             "Minimum rating",
             options=["Any", "3.0", "3.5", "4.0", "4.5", "5.0"],
@@ -375,7 +435,7 @@ def main() -> None:
         min_rating = None if min_rating_choice == "Any" else float(min_rating_choice)
         cuisine = st.selectbox(
             "Cuisine",
-            options=[None] + cuisines,
+            options=cuisines,
             format_func=lambda x: "Any" if x is None else x,
             key="cuisine",
         )
@@ -385,18 +445,15 @@ def main() -> None:
         st.info("Set your preferences in the sidebar and click **Get recommendations**.")
         return
 
-    prefs = RecommendPreferences(
-        location=location or None,
-        min_rating=float(min_rating) if min_rating is not None else None,
-        min_cost=min_cost,
-        max_cost=max_cost,
-        cuisines=[cuisine] if cuisine else None,
+    result = _cached_recommend(
+        str(db_path),
+        location or None,
+        float(min_rating) if min_rating is not None else None,
+        min_cost,
+        max_cost,
+        cuisine,
+        TOP_N,
     )
-    store = get_store(db_path)
-    try:
-        result = recommend(store, prefs, top_n=TOP_N, relax_if_empty=False)
-    finally:
-        store.close()
 
     restaurants = result["restaurants"]
     summary = result.get("summary")
@@ -404,10 +461,7 @@ def main() -> None:
 
     if summary:
         st.markdown('<h2 class="zomato-section-title">Summary</h2>', unsafe_allow_html=True)
-        st.markdown(
-            f'<div class="streamlit-zomato-summary"><p class="streamlit-zomato-summary-text">{html.escape(summary)}</p></div>',
-            unsafe_allow_html=True,
-        )
+        st.markdown(_summary_html(summary), unsafe_allow_html=True)
 
     st.markdown('<h2 class="zomato-section-title">Restaurants</h2>', unsafe_allow_html=True)
     if not restaurants:
@@ -417,12 +471,16 @@ def main() -> None:
     if relaxed:
         st.caption("Some filters were relaxed to show results.")
 
-    count_text = f"{len(restaurants)} restaurant{'s' if len(restaurants) != 1 else ''}"
+    n = len(restaurants)
+    count_text = f"{n} restaurant{'s' if n != 1 else ''}"
     st.markdown(f'<p class="zomato-results-count">{count_text}</p>', unsafe_allow_html=True)
 
-    cards_html = "".join(_render_restaurant_card(r) for r in restaurants)
-    grid_doc = f"""<!DOCTYPE html><html><head><style>{GRID_IFRAME_CSS}</style></head><body><div class="streamlit-zomato-grid">{cards_html}</div></body></html>"""
-    components.html(grid_doc, height=min(800, 200 + len(restaurants) * 140), scrolling=True)
+    # One join over all parts (no intermediate cards_html string); a list lets str.join pre-size
+    parts = [_GRID_DOC_HEAD]
+    parts.extend([_render_restaurant_card(r) for r in restaurants])
+    parts.append(_GRID_DOC_TAIL)
+    grid_doc = "".join(parts)
+    components.html(grid_doc, height=min(800, 200 + n * 140), scrolling=True)
 
 
 main()